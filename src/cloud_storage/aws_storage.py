@@ -1,15 +1,50 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 from src.configuration.aws_connection import S3Client
-from io import StringIO
+from io import StringIO, BytesIO, BufferedReader, RawIOBase
 from typing import Union, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
 import sys
 from src.logger import log
+from src.constants import (S3_DOWNLOAD_PART_SIZE, S3_DOWNLOAD_CONCURRENCY, S3_DOWNLOAD_ETAG_ATTEMPTS,
+                           S3_UPLOAD_CHUNK_SIZE, S3_UPLOAD_CONCURRENCY, S3_UPLOAD_MAX_IO_QUEUE)
 from mypy_boto3_s3.service_resource import Bucket
 from src.exception import CustomException
 from botocore.exceptions import ClientError
 from pandas import DataFrame, read_csv
-import pickle
+import joblib
+
+# Multipart settings shared by every upload
+_TRANSFER_CFG = TransferConfig(
+    multipart_threshold=S3_UPLOAD_CHUNK_SIZE,
+    multipart_chunksize=S3_UPLOAD_CHUNK_SIZE,
+    max_concurrency=S3_UPLOAD_CONCURRENCY,
+    use_threads=True,
+    max_io_queue=S3_UPLOAD_MAX_IO_QUEUE
+)
+
+
+class _StreamingBodyReader(RawIOBase):
+    """Raw stream over a botocore StreamingBody, so reads keep its content-length and checksum validation."""
+
+    def __init__(self, body):
+        self._body = body
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        chunk = self._body.read(len(b))
+        b[:len(chunk)] = chunk
+        return len(chunk)
+
+    def close(self) -> None:
+        # Release the body's pooled HTTP connection even when the reader is abandoned mid-stream
+        if not self.closed:
+            self._body.close()
+        super().close()
 
 
 class SimpleStorageService:
@@ -25,14 +60,28 @@ class SimpleStorageService:
         self.s3_client = s3_client.s3_client
 
     def s3_key_path_available(self, bucket_name: str, s3_key: str) -> bool:
-        """Checks if a specified S3 key path exists in the bucket."""
+        """Checks if a specified S3 key exists in the bucket with a single HEAD request."""
         try:
-            bucket = self.get_bucket(bucket_name)
-            return any(bucket.objects.filter(Prefix=s3_key))
+            self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return False
+            log.error(f"Error checking S3 key path: {s3_key} in bucket: {bucket_name}")
+            raise CustomException(e, sys)
         except Exception as e:
             log.error(f"Error checking S3 key path: {s3_key} in bucket: {bucket_name}")
             raise CustomException(e, sys)
 
+    def exists_prefix(self, bucket_name: str, prefix: str) -> bool:
+        """Checks if any object in the bucket starts with the specified prefix."""
+        try:
+            bucket = self.get_bucket(bucket_name)
+            return any(bucket.objects.filter(Prefix=prefix))
+        except Exception as e:
+            log.error(f"Error checking S3 prefix: {prefix} in bucket: {bucket_name}")
+            raise CustomException(e, sys)
+
     @staticmethod
     def read_object(object_: object, decode: bool = True, make_readable: bool = False) -> Union[StringIO, str]:
         """Reads an S3 object with optional decoding and conversion to StringIO."""
@@ -45,6 +94,42 @@ class SimpleStorageService:
             log.error("Error reading S3 object")
             raise CustomException(e, sys)
 
+    def _parallel_get(self, bucket_name: str, key: str, part_size: int = S3_DOWNLOAD_PART_SIZE,
+                      concurrency: int = S3_DOWNLOAD_CONCURRENCY) -> BytesIO:
+        """Downloads an S3 object with concurrent byte-range GETs into a single pre-allocated buffer.
+        Every range is pinned to the ETag from the HEAD, and the download restarts if the object changes."""
+        try:
+            for attempt in range(1, S3_DOWNLOAD_ETAG_ATTEMPTS + 1):
+                head = self.s3_client.head_object(Bucket=bucket_name, Key=key)
+                content_length, etag = head["ContentLength"], head["ETag"]
+                bio = BytesIO(bytes(content_length))
+                ranges = [(start, min(start + part_size, content_length) - 1)
+                          for start in range(0, content_length, part_size)]
+
+                def fetch_range(byte_range):
+                    start, end = byte_range
+                    response = self.s3_client.get_object(Bucket=bucket_name, Key=key, IfMatch=etag,
+                                                         Range=f"bytes={start}-{end}")
+                    view[start:end + 1] = response["Body"].read()
+
+                try:
+                    # Parts land directly in the BytesIO's own buffer, so the result needs no extra copy
+                    with bio.getbuffer() as view, ThreadPoolExecutor(max_workers=concurrency) as executor:
+                        list(executor.map(fetch_range, ranges))
+                except ClientError as e:
+                    # 412: the object was overwritten mid-download, so the parts would mix two versions
+                    if e.response["Error"]["Code"] != "PreconditionFailed" or attempt == S3_DOWNLOAD_ETAG_ATTEMPTS:
+                        raise
+                    log.warning(f"{key} in {bucket_name} changed during download, retrying ({attempt})")
+                    continue
+
+                log.info(f"Downloaded {key} from {bucket_name} in {len(ranges)} parts")
+                bio.seek(0)
+                return bio
+        except Exception as e:
+            log.error(f"Error downloading {key} from bucket: {bucket_name}")
+            raise CustomException(e, sys)
+
     def get_bucket(self, bucket_name: str) -> Bucket:
         """Retrieves the S3 bucket object."""
         try:
@@ -67,14 +152,19 @@ class SimpleStorageService:
         """Loads a serialized model from the S3 bucket."""
         try:
             model_file = f"{model_dir}/{model_name}" if model_dir else model_name
-            file_object = self.get_file_object(model_file, bucket_name)
-            model_data = self.read_object(file_object, decode=False)
 
-            if not model_data:
+            # Fetch the exact key; other objects sharing the prefix (e.g. backups) are not part of the model
+            response = self.s3_client.get_object(Bucket=bucket_name, Key=model_file)
+            if not response["ContentLength"]:
                 raise CustomException(f"Model file {model_name} is empty or missing.", sys)
 
+            # Deserialize straight off the response stream instead of materializing the body first
+            with BufferedReader(_StreamingBodyReader(response["Body"]), buffer_size=1 << 20) as stream:
+                model = joblib.load(stream)
+                # Read to the end so the body verifies the full length arrived, even if unpickling stopped early
+                stream.read()
             log.info(f"Loaded model {model_name} from bucket {bucket_name}")
-            return pickle.loads(model_data)
+            return model
         except Exception as e:
             log.error(f"Error loading model: {model_name} from bucket: {bucket_name}")
             raise CustomException(e, sys)
@@ -96,7 +186,7 @@ class SimpleStorageService:
         """Uploads a local file to S3 with an optional delete flag."""
         try:
             log.info(f"Uploading {from_filename} to {to_filename} in {bucket_name}")
-            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename)
+            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename, Config=_TRANSFER_CFG)
 
             if remove:
                 os.remove(from_filename)
@@ -105,11 +195,22 @@ class SimpleStorageService:
             log.error(f"Error uploading file: {from_filename} to {to_filename} in bucket: {bucket_name}")
             raise CustomException(e, sys)
 
+    def upload_df_as_csv_stream(self, data_frame: DataFrame, bucket_filename: str, bucket_name: str) -> None:
+        """Uploads a DataFrame as a CSV file to S3 straight from memory, without a local temp file."""
+        try:
+            buffer = BytesIO()
+            data_frame.to_csv(buffer, index=False, header=True)
+            buffer.seek(0)
+            self.s3_client.upload_fileobj(buffer, bucket_name, bucket_filename, Config=_TRANSFER_CFG)
+            log.info(f"Uploaded DataFrame to {bucket_filename} in {bucket_name}")
+        except Exception as e:
+            log.error(f"Error streaming DataFrame as CSV to bucket: {bucket_name}")
+            raise CustomException(e, sys)
+
     def upload_df_as_csv(self, data_frame: DataFrame, local_filename: str, bucket_filename: str, bucket_name: str) -> None:
-        """Uploads a DataFrame as a CSV file to S3."""
+        """Uploads a DataFrame as a CSV file to S3. `local_filename` is kept for compatibility; nothing is written to disk."""
         try:
-            data_frame.to_csv(local_filename, index=False, header=True)
-            self.upload_file(local_filename, bucket_filename, bucket_name)
+            self.upload_df_as_csv_stream(data_frame, bucket_filename, bucket_name)
         except Exception as e:
             log.error(f"Error uploading DataFrame as CSV to bucket: {bucket_name}")
             raise CustomException(e, sys)
@@ -117,8 +218,12 @@ class SimpleStorageService:
     def get_df_from_object(self, object_: object) -> DataFrame:
         """Converts an S3 object to a DataFrame."""
         try:
-            content = self.read_object(object_, make_readable=True)
-            return read_csv(content, na_values="na")
+            if object_.size > S3_DOWNLOAD_PART_SIZE:
+                content = self._parallel_get(object_.bucket_name, object_.key)
+            else:
+                # Hand pandas the raw bytes; its C parser decodes them itself
+                content = BytesIO(self.read_object(object_, decode=False))
+            return read_csv(content, na_values="na", engine="c")
         except Exception as e:
             log.error("Error converting S3 object to DataFrame")
             raise CustomException(e, sys)
@@ -131,3 +236,9 @@ class SimpleStorageService:
         except Exception as e:
             log.error(f"Error reading CSV file: {filename} from bucket: {bucket_name}")
             raise CustomException(e, sys)
+
+
+@lru_cache(maxsize=1)
+def get_s3_storage() -> SimpleStorageService:
+    """Returns the process-wide SimpleStorageService, creating it on first use."""
+    return SimpleStorageService()
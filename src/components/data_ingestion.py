@@ -1,9 +1,13 @@
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
+import pyarrow as pa
+import pyarrow.csv
 from pandas import DataFrame
 from sklearn.model_selection import train_test_split
 
+from src.constants import DATA_INGESTION_PARQUET_ROW_GROUP_SIZE
 from src.entity.config_entity import DataIngestionConfig
 from src.entity.artifact_entity import DataIngestionArtifact
 from src.exception import CustomException
@@ -21,6 +25,27 @@ class DataIngestion:
         except Exception as e:
             raise CustomException(e, sys) from e
 
+    @staticmethod
+    def write_data(dataframe: DataFrame, file_path: str) -> None:
+        """
+        Writes a DataFrame to CSV through pyarrow's multithreaded writer.
+        """
+        try:
+            pa.csv.write_csv(pa.Table.from_pandas(dataframe, preserve_index=False), file_path)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def write_parquet(dataframe: DataFrame, file_path: str) -> None:
+        """
+        Writes a DataFrame to a zstd-compressed Parquet file, keeping column types for downstream stages.
+        """
+        try:
+            dataframe.to_parquet(file_path, compression="zstd", row_group_size=DATA_INGESTION_PARQUET_ROW_GROUP_SIZE,
+                                 index=False)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
     def export_data_into_feature_store(self) -> DataFrame:
         """
         Exports data from MongoDB and saves it as a CSV file.
@@ -44,7 +69,7 @@ class DataIngestion:
             # Save to feature store
             feature_store_file_path = self.data_ingestion_config.feature_store_file_path
             os.makedirs(os.path.dirname(feature_store_file_path), exist_ok=True)
-            dataframe.to_csv(feature_store_file_path, index=False, header=True)
+            self.write_data(dataframe, feature_store_file_path)
 
             log.info(f"Data successfully saved to feature store: {feature_store_file_path}")
             return dataframe
@@ -54,7 +79,7 @@ class DataIngestion:
 
     def split_data_as_train_test(self, dataframe: DataFrame) -> None:
         """
-        Splits the data into training and testing sets and saves them as CSV files.
+        Splits the data into training and testing sets and saves them as Parquet files.
 
         Parameters:
         -----------
@@ -73,9 +98,14 @@ class DataIngestion:
             # Create directories if they don't exist
             os.makedirs(os.path.dirname(self.data_ingestion_config.training_file_path), exist_ok=True)
 
-            # Save train and test datasets
-            train_set.to_csv(self.data_ingestion_config.training_file_path, index=False, header=True)
-            test_set.to_csv(self.data_ingestion_config.testing_file_path, index=False, header=True)
+            # Save train and test datasets concurrently; pyarrow's writer releases the GIL
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [
+                    pool.submit(self.write_parquet, train_set, self.data_ingestion_config.training_file_path),
+                    pool.submit(self.write_parquet, test_set, self.data_ingestion_config.testing_file_path),
+                ]
+                for future in futures:
+                    future.result()
 
             log.info("Train and test datasets successfully saved.")
 
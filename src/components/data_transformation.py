@@ -1,12 +1,16 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 from imblearn.combine import SMOTEENN
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.compose import ColumnTransformer
 
-from src.constants import TARGET_COLUMN, SCHEMA_FILE_PATH, CURRENT_YEAR
+from src.constants import (TARGET_COLUMN, SCHEMA_FILE_PATH, CURRENT_YEAR, DATA_TRANSFORMATION_READ_BATCH_SIZE,
+                           CATEGORY_LEVELS, ENCODED_FEATURES)
 from src.entity.config_entity import DataTransformationConfig
 from src.entity.artifact_entity import DataTransformationArtifact, DataIngestionArtifact, DataValidationArtifact
 from src.exception import CustomException
@@ -26,10 +30,19 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
 
-    @staticmethod
-    def read_data(file_path) -> pd.DataFrame:
+    def read_data(self, file_path) -> pd.DataFrame:
+        """
+        Streams the Parquet file batch by batch and applies the custom feature transformations
+        to each batch, so only one raw batch is held in memory at a time.
+        """
         try:
-            return pd.read_csv(file_path)
+            chunks = []
+            with pq.ParquetFile(file_path) as parquet_file:
+                for batch in parquet_file.iter_batches(batch_size=DATA_TRANSFORMATION_READ_BATCH_SIZE):
+                    chunk = batch.to_pandas(split_blocks=True, self_destruct=True)
+                    chunks.append(self._preprocess_features(chunk))
+
+            return pd.concat(chunks, ignore_index=True, copy=False)
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -43,8 +56,9 @@ class DataTransformation:
 
         try:
             # Initialize transformers
-            numeric_transformer = StandardScaler()
-            min_max_scaler = MinMaxScaler()
+            # Inputs are cast to float32 beforehand, so the scalers can work on them without copying
+            numeric_transformer = StandardScaler(copy=False)
+            min_max_scaler = MinMaxScaler(copy=False)
             log.info("Transformers Initialized: StandardScaler-MinMaxScaler")
 
             # Load schema configurations
@@ -71,37 +85,27 @@ class DataTransformation:
             log.exception("Exception occurred in get_data_transformer_object method of DataTransformation class")
             raise CustomException(e, sys) from e
 
-    def _map_gender_column(self, df):
-        """Map Gender column to 0 for Female and 1 for Male."""
-        log.info("Mapping 'Gender' column to binary values")
-        df['Gender'] = df['Gender'].map({'Female': 0, 'Male': 1}).astype(int)
-        return df
-
-    def _create_dummy_columns(self, df):
-        """Create dummy variables for categorical features."""
-        log.info("Creating dummy variables for categorical features")
-        df = pd.get_dummies(df, drop_first=True)
-        return df
-
-    def _rename_columns(self, df):
-        """Rename specific columns and ensure integer types for dummy columns."""
-        log.info("Renaming specific columns and casting to int")
-        df = df.rename(columns={
-            "Vehicle_Age_< 1 Year": "Vehicle_Age_lt_1_Year",
-            "Vehicle_Age_> 2 Years": "Vehicle_Age_gt_2_Years"
-        })
-        for col in ["Vehicle_Age_lt_1_Year", "Vehicle_Age_gt_2_Years", "Vehicle_Damage_Yes"]:
-            if col in df.columns:
-                df[col] = df[col].astype('int')
+    def _preprocess_features(self, df):
+        """
+        Applies the custom transformations in a single in-place pass: drops the id column,
+        encodes Gender (1 for Male) and the Vehicle_Age/Vehicle_Damage dummy columns with
+        direct comparisons, then drops the original categorical columns.
+        """
+        log.info("Dropping id column, encoding Gender and creating dummy variables")
+        df.drop(columns=[self._schema_config['drop_columns']], inplace=True, errors='ignore')
+        for feature, (source, level) in ENCODED_FEATURES.items():
+            df[feature] = (df[source].values == level).astype(np.uint8)
+        df.drop(columns=[col for col in CATEGORY_LEVELS if col not in ENCODED_FEATURES], inplace=True)
         return df
 
-    def _drop_id_column(self, df):
-        """Drop the 'id' column if it exists."""
-        log.info("Dropping 'id' column")
-        drop_col = self._schema_config['drop_columns']
-        if drop_col in df.columns:
-            df = df.drop(drop_col, axis=1)
-        return df
+    @staticmethod
+    def _concat_features_target(features, target) -> np.ndarray:
+        """Write features and target into one preallocated float32 array, target as the last column."""
+        n_rows, n_features = features.shape
+        out = np.empty((n_rows, n_features + 1), dtype=np.float32)
+        out[:, :n_features] = features
+        out[:, n_features] = np.asarray(target, dtype=np.float32)
+        return out
 
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         """
@@ -112,10 +116,10 @@ class DataTransformation:
             if not self.data_validation_artifact.validation_status:
                 raise Exception(self.data_validation_artifact.message)
 
-            # Load train and test data
+            # Load train and test data; custom transformations are applied while reading
             train_df = self.read_data(file_path=self.data_ingestion_artifact.trained_file_path)
             test_df = self.read_data(file_path=self.data_ingestion_artifact.test_file_path)
-            log.info("Train-Test data loaded")
+            log.info("Train-Test data loaded and custom transformations applied")
 
             input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
             target_feature_train_df = train_df[TARGET_COLUMN]
@@ -124,40 +128,36 @@ class DataTransformation:
             target_feature_test_df = test_df[TARGET_COLUMN]
             log.info("Input and Target cols defined for both train and test df.")
 
-            # Apply custom transformations in specified sequence
-            input_feature_train_df = self._map_gender_column(input_feature_train_df)
-            input_feature_train_df = self._drop_id_column(input_feature_train_df)
-            input_feature_train_df = self._create_dummy_columns(input_feature_train_df)
-            input_feature_train_df = self._rename_columns(input_feature_train_df)
-
-            input_feature_test_df = self._map_gender_column(input_feature_test_df)
-            input_feature_test_df = self._drop_id_column(input_feature_test_df)
-            input_feature_test_df = self._create_dummy_columns(input_feature_test_df)
-            input_feature_test_df = self._rename_columns(input_feature_test_df)
-            log.info("Custom transformations applied to train and test data")
+            scaled_columns = self._schema_config['num_features'] + self._schema_config['mm_columns']
+            input_feature_train_df[scaled_columns] = input_feature_train_df[scaled_columns].astype(np.float32, copy=False)
+            input_feature_test_df[scaled_columns] = input_feature_test_df[scaled_columns].astype(np.float32, copy=False)
+            log.info("Scaled cols cast to float32.")
 
             log.info("Starting data transformation")
             preprocessor = self.get_data_transformer_object()
             log.info("Got the preprocessor object")
 
-            log.info("Initializing transformation for Training-data")
-            input_feature_train_arr = preprocessor.fit_transform(input_feature_train_df)
-            log.info("Initializing transformation for Testing-data")
-            input_feature_test_arr = preprocessor.transform(input_feature_test_df)
+            log.info("Fitting preprocessor on Training-data")
+            preprocessor.fit(input_feature_train_df)
+
+            # Train and test branches share no state once the preprocessor is fitted
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                log.info("Initializing transformation for Training-data and Testing-data")
+                f_train = pool.submit(preprocessor.transform, input_feature_train_df)
+                f_test = pool.submit(preprocessor.transform, input_feature_test_df)
+                input_feature_train_arr, input_feature_test_arr = f_train.result(), f_test.result()
             log.info("Transformation done end to end to train-test df.")
 
-            log.info("Applying SMOTEENN for handling imbalanced dataset.")
-            smt = SMOTEENN(sampling_strategy="minority")
-            input_feature_train_final, target_feature_train_final = smt.fit_resample(
-                input_feature_train_arr, target_feature_train_df
-            )
-            input_feature_test_final, target_feature_test_final = smt.fit_resample(
-                input_feature_test_arr, target_feature_test_df
-            )
-            log.info("SMOTEENN applied to train-test df.")
+            # Resample the training data only; the test set keeps its real class distribution
+            log.info("Applying SMOTEENN on training data for handling imbalanced dataset.")
+            x_train = np.ascontiguousarray(input_feature_train_arr, dtype=np.float32)
+            y_train = np.ascontiguousarray(target_feature_train_df.to_numpy(dtype=np.int8))
+            smt = SMOTEENN(sampling_strategy="minority", n_jobs=-1)
+            input_feature_train_final, target_feature_train_final = smt.fit_resample(x_train, y_train)
+            log.info("SMOTEENN applied to train df.")
 
-            train_arr = np.c_[input_feature_train_final, np.array(target_feature_train_final)]
-            test_arr = np.c_[input_feature_test_final, np.array(target_feature_test_final)]
+            train_arr = self._concat_features_target(input_feature_train_final, target_feature_train_final)
+            test_arr = self._concat_features_target(input_feature_test_arr, target_feature_test_df.to_numpy())
             log.info("feature-target concatenation done for train-test df.")
 
             save_object(self.data_transformation_config.transformed_object_file_path, preprocessor)
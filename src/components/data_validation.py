@@ -2,7 +2,7 @@ import json
 import sys
 import os
 
-import pandas as pd
+import pyarrow.parquet as pq
 from pandas import DataFrame
 
 from src.exception import CustomException
@@ -25,6 +25,8 @@ class DataValidation:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
             self._schema_config = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+            self._num_set = frozenset(self._schema_config["numerical_columns"])
+            self._cat_set = frozenset(self._schema_config["categorical_columns"])
         except Exception as e:
             raise CustomException(e, sys) from e
 
@@ -54,13 +56,13 @@ class DataValidation:
         try:
             dataframe_columns = set(df.columns)
             missing_columns = {
-                "numerical": [col for col in self._schema_config["numerical_columns"] if col not in dataframe_columns],
-                "categorical": [col for col in self._schema_config["categorical_columns"] if col not in dataframe_columns],
+                "numerical": self._num_set - dataframe_columns,
+                "categorical": self._cat_set - dataframe_columns,
             }
 
             for col_type, missing in missing_columns.items():
                 if missing:
-                    log.warning(f"Missing {col_type} columns: {missing}")
+                    log.warning(f"Missing {col_type} columns: {sorted(missing)}")
 
             return not any(missing_columns.values())  # True if no missing columns, False otherwise.
         except Exception as e:
@@ -69,14 +71,14 @@ class DataValidation:
     @staticmethod
     def read_data(file_path: str) -> DataFrame:
         """
-        Reads a CSV file and returns a dataframe.
+        Reads only the schema of a Parquet file, since validation only inspects the columns.
 
-        :param file_path: Path to the CSV file.
-        :return: DataFrame containing the data.
+        :param file_path: Path to the Parquet file.
+        :return: Empty DataFrame carrying the file's columns.
         """
         try:
-            log.info(f"Reading data from {file_path}")
-            return pd.read_csv(file_path)
+            log.info(f"Reading schema from {file_path}")
+            return DataFrame(columns=pq.read_schema(file_path).names)
         except Exception as e:
             raise CustomException(e, sys) from e
 
@@ -1,17 +1,39 @@
 import sys
 import logging
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Sequence
 from dataclasses import dataclass
 from sklearn.metrics import f1_score
 from src.exception import CustomException
 from src.logger import log
-from src.constants import TARGET_COLUMN
+from src.constants import TARGET_COLUMN, CATEGORY_LEVELS, ENCODED_FEATURES
 from src.utils.main_utils import load_object
 from src.entity.s3_estimator import ProjEstimator
 from src.entity.config_entity import ModelEvaluationConfig
 from src.entity.artifact_entity import ModelTrainerArtifact, DataIngestionArtifact, ModelEvaluationArtifact
 
+# Fixed-level categoricals, so the category codes double as encodings
+CATEGORY_DTYPES = {col: pd.CategoricalDtype(categories=levels) for col, levels in CATEGORY_LEVELS.items()}
+
+
+def find_production_model(model_eval_config: ModelEvaluationConfig) -> Optional[ProjEstimator]:
+    """
+    Looks up the production model in S3 and starts downloading it in the background.
+    Returns None when no production model exists yet.
+    """
+    bucket_name = model_eval_config.bucket_name
+    model_path = model_eval_config.s3_model_key_path
+    proj_estimator = ProjEstimator(bucket_name=bucket_name, model_path=model_path)
+
+    if proj_estimator.is_model_present(model_path=model_path):
+        log.info("Best model found at %s in %s.", model_path, bucket_name)
+        proj_estimator.prefetch_model()
+        return proj_estimator
+    log.info("No existing production model found.")
+    return None
+
+
 @dataclass
 class EvaluateModelResponse:
     trained_model_f1_score: float
@@ -27,14 +49,18 @@ class ModelEvaluation:
 
     def __init__(self, model_eval_config: ModelEvaluationConfig,
                  data_ingestion_artifact: DataIngestionArtifact,
-                 model_trainer_artifact: ModelTrainerArtifact):
+                 model_trainer_artifact: ModelTrainerArtifact,
+                 best_model: Optional[ProjEstimator] = None):
         """
         Initialize ModelEvaluation class.
+
+        :param best_model: Production model the caller already looked up (and started downloading).
         """
         try:
             self.model_eval_config = model_eval_config
             self.data_ingestion_artifact = data_ingestion_artifact
             self.model_trainer_artifact = model_trainer_artifact
+            self.best_model = best_model
         except Exception as e:
             log.error(f"Error initializing ModelEvaluation: {e}")
             raise CustomException(e, sys)
@@ -44,48 +70,36 @@ class ModelEvaluation:
         Fetches the best production model from S3 if available.
         """
         try:
-            bucket_name = self.model_eval_config.bucket_name
-            model_path = self.model_eval_config.s3_model_key_path
-            proj_estimator = ProjEstimator(bucket_name=bucket_name, model_path=model_path)
-
-            if proj_estimator.is_model_present(model_path=model_path):
-                log.info(f"Best model found at {model_path} in {bucket_name}.")
-                return proj_estimator
-            log.info("No existing production model found.")
-            return None
+            if self.best_model is not None:
+                # Found by the caller, whose prefetch is already under way
+                return self.best_model
+
+            # Start the download now so it overlaps with test data loading
+            return find_production_model(self.model_eval_config)
         except Exception as e:
             log.error(f"Error retrieving best model: {e}")
             raise CustomException(e, sys)
 
-    def _preprocess_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _preprocess_features(self, df: pd.DataFrame, feature_names: Sequence[str]) -> pd.DataFrame:
         """
-        Applies preprocessing steps: gender mapping, dummy variables, renaming, and ID column removal.
+        Builds the model input in one pass: numeric features, gender and dummy encodings
+        are written straight into a float32 matrix laid out as `feature_names`, leaving out `_id`.
         """
         try:
             log.info("Applying preprocessing steps...")
 
-            # Gender Mapping
-            if "Gender" in df.columns:
-                df["Gender"] = df["Gender"].map({"Female": 0, "Male": 1}).astype(int)
-
-            # Drop ID column if present
-            if "_id" in df.columns:
-                df = df.drop("_id", axis=1)
-
-            # Create Dummy Variables
-            df = pd.get_dummies(df, drop_first=True)
-
-            # Rename columns for consistency
-            rename_dict = {
-                "Vehicle_Age_< 1 Year": "Vehicle_Age_lt_1_Year",
-                "Vehicle_Age_> 2 Years": "Vehicle_Age_gt_2_Years"
-            }
-            df = df.rename(columns=rename_dict)
-
-            # Convert categorical dummy columns to integer type
-            for col in ["Vehicle_Age_lt_1_Year", "Vehicle_Age_gt_2_Years", "Vehicle_Damage_Yes"]:
-                if col in df.columns:
-                    df[col] = df[col].astype(int)
+            # Fill a single float32 matrix column by column, in the order the fitted preprocessor expects
+            out = np.empty((len(df), len(feature_names)), dtype=np.float32)
+            codes = {col: pd.Categorical(df[col], dtype=dtype).codes for col, dtype in CATEGORY_DTYPES.items()}
+            for slot, name in enumerate(feature_names):
+                if name in ENCODED_FEATURES:
+                    # Equality masks on the category codes, as in DataTransformation: unknown or missing
+                    # values (code -1) encode as 0 instead of leaking -1 into the features
+                    source, level = ENCODED_FEATURES[name]
+                    out[:, slot] = codes[source] == CATEGORY_LEVELS[source].index(level)
+                else:
+                    out[:, slot] = df[name].to_numpy(np.float32)
+            df = pd.DataFrame(out, columns=feature_names, copy=False)
 
             log.info("Feature preprocessing completed.")
             return df
@@ -99,27 +113,31 @@ class ModelEvaluation:
         Evaluates the trained model against the best production model.
         """
         try:
-            test_df = pd.read_csv(self.data_ingestion_artifact.test_file_path)
-            X, y = test_df.drop(columns=[TARGET_COLUMN]), test_df[TARGET_COLUMN]
+            # Look up the production model first so its download runs while the test data is prepared
+            best_model = self.get_best_model()
 
-            log.info("Test data loaded. Beginning preprocessing...")
+            test_df = pd.read_parquet(self.data_ingestion_artifact.test_file_path, engine="pyarrow")
+            X, y = test_df.drop(columns=[TARGET_COLUMN]), test_df[TARGET_COLUMN]
 
-            X = self._preprocess_features(X)
+            log.info("Test data loaded.")
 
             # Load trained model
             trained_model = load_object(file_path=self.model_trainer_artifact.trained_model_file_path)
             trained_model_f1_score = self.model_trainer_artifact.metric_artifact.f1_score
-            log.info(f"Trained Model F1 Score: {trained_model_f1_score}")
+            log.info("Trained Model F1 Score: %s", trained_model_f1_score)
 
             # Compare with best production model (if available)
-            best_model = self.get_best_model()
             best_model_f1_score = None
 
             if best_model is not None:
                 log.info("Evaluating production model performance...")
-                y_hat_best_model = best_model.predict(X)
+                # Lay the features out as the production model's fitted preprocessor saw them in training
+                feature_names = best_model.load_model().preprocessing_object.feature_names_in_
+                X = self._preprocess_features(X, feature_names)
+                # Predict in mini-batches to bound the memory of the preprocessing transform
+                y_hat_best_model = best_model.predict(X, batch_size=self.model_eval_config.predict_batch_size)
                 best_model_f1_score = f1_score(y, y_hat_best_model)
-                log.info(f"Production Model F1 Score: {best_model_f1_score}")
+                log.info("Production Model F1 Score: %s", best_model_f1_score)
 
             # Determine if the trained model should replace the best model
             tmp_best_model_score = best_model_f1_score or 0
@@ -133,7 +151,7 @@ class ModelEvaluation:
                 difference=difference
             )
 
-            log.info(f"Evaluation Result: {result}")
+            log.info("Evaluation Result: %s", result)
             return result
 
         except Exception as e:
@@ -156,7 +174,7 @@ class ModelEvaluation:
                 changed_accuracy=evaluate_model_response.difference
             )
 
-            log.info(f"Model evaluation completed: {model_evaluation_artifact}")
+            log.info("Model evaluation completed: %s", model_evaluation_artifact)
             return model_evaluation_artifact
 
         except Exception as e:
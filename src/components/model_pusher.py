@@ -1,5 +1,5 @@
 import sys
-from src.cloud_storage.aws_storage import SimpleStorageService
+from src.cloud_storage.aws_storage import get_s3_storage
 from src.exception import CustomException
 from src.logger import log
 from src.entity.artifact_entity import ModelPusherArtifact, ModelEvaluationArtifact
@@ -16,7 +16,7 @@ class ModelPusher:
         :param model_evaluation_artifact: Contains model evaluation details including trained model path.
         :param model_pusher_config: Configuration details for model pushing.
         """
-        self.s3 = SimpleStorageService()
+        self.s3 = get_s3_storage()
         self.model_evaluation_artifact = model_evaluation_artifact
         self.model_pusher_config = model_pusher_config
         self.proj_estimator = ProjEstimator(
@@ -45,7 +45,8 @@ class ModelTrainer:
                 min_samples_leaf = self.model_trainer_config._min_samples_leaf,
                 max_depth = self.model_trainer_config._max_depth,
                 criterion = self.model_trainer_config._criterion,
-                random_state = self.model_trainer_config._random_state
+                random_state = self.model_trainer_config._random_state,
+                n_jobs = -1
             )
 
             log.info("Training the RandomForest model...")
@@ -64,7 +65,8 @@ class ModelTrainer:
             metric_artifact = ClassificationMetricArtifact(
                 f1_score=f1,
                 precision_score=precision,
-                recall_score=recall
+                recall_score=recall,
+                accuracy_score=accuracy
             )
             return model, metric_artifact
 
@@ -89,9 +91,10 @@ class ModelTrainer:
             preprocessing_obj = load_object(self.data_transformation_artifact.transformed_object_file_path)
 
             log.info("Validating trained model accuracy against expected threshold.")
-            train_accuracy = accuracy_score(train_arr[:, -1], trained_model.predict(train_arr[:, :-1]))
-            if train_accuracy < self.model_trainer_config.expected_accuracy:
-                log.warning(f"Model accuracy {train_accuracy:.4f} is below the expected threshold {self.model_trainer_config.expected_accuracy:.4f}.")
+            # Reuse the test accuracy from the report instead of predicting the whole training set again
+            test_accuracy = metric_artifact.accuracy_score
+            if test_accuracy < self.model_trainer_config.expected_accuracy:
+                log.warning(f"Model accuracy {test_accuracy:.4f} is below the expected threshold {self.model_trainer_config.expected_accuracy:.4f}.")
                 raise CustomException("Trained model does not meet the required accuracy threshold.")
 
             log.info("Saving the trained model along with preprocessing pipeline.")
@@ -1,56 +1,60 @@
 import boto3
 import os
-from src.constants import AWS_SECRET_ACCESS_KEY_ENV_KEY, AWS_ACCESS_KEY_ID_ENV_KEY, REGION_NAME
+from functools import lru_cache
+from botocore.config import Config
+from src.constants import (AWS_SECRET_ACCESS_KEY_ENV_KEY, AWS_ACCESS_KEY_ID_ENV_KEY, REGION_NAME,
+                           S3_MAX_POOL_CONNECTIONS, S3_MAX_RETRY_ATTEMPTS, S3_USE_ACCELERATE_ENDPOINT)
 from src.logger import log
 
 
+@lru_cache(maxsize=1)
+def _get_s3_client(region_name: str = REGION_NAME) -> tuple:
+    """
+    Builds the S3 resource and client once per process from a single boto3 session.
+    Returns a (resource, client) tuple; later calls reuse the cached connection pool.
+    """
+    log.info("Initializing AWS S3 connection...")
+
+    access_key_id = os.getenv(AWS_ACCESS_KEY_ID_ENV_KEY)
+    secret_access_key = os.getenv(AWS_SECRET_ACCESS_KEY_ENV_KEY)
+
+    if not access_key_id:
+        raise ValueError(f"Missing environment variable: {AWS_ACCESS_KEY_ID_ENV_KEY}")
+    if not secret_access_key:
+        raise ValueError(f"Missing environment variable: {AWS_SECRET_ACCESS_KEY_ENV_KEY}")
+
+    try:
+        # One session and a larger connection pool so concurrent downloads don't queue on HTTPS connections
+        session = boto3.session.Session(
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            region_name=region_name
+        )
+        config = Config(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            retries={'max_attempts': S3_MAX_RETRY_ATTEMPTS, 'mode': 'adaptive'},
+            tcp_keepalive=True,
+            s3={'use_accelerate_endpoint': S3_USE_ACCELERATE_ENDPOINT, 'addressing_style': 'virtual'}
+        )
+        s3_resource = session.resource('s3', config=config)
+        s3_client = session.client('s3', config=config)
+        log.info("AWS S3 connection established successfully.")
+        return s3_resource, s3_client
+
+    except Exception as e:
+        log.error(f"Failed to initialize AWS S3 connection: {str(e)}", exc_info=True)
+        raise RuntimeError("AWS S3 initialization failed. Check credentials and network.") from e
+
+
 class S3Client:
     """
     A Singleton class to manage AWS S3 connection using boto3.
     Ensures credentials are securely retrieved from environment variables.
     """
-    _s3_client = None
-    _s3_resource = None
 
     def __init__(self, region_name: str = REGION_NAME):
         """
-        Initializes an S3 connection if not already established.
+        Attaches the process-wide S3 connection, establishing it on first use.
         Raises an exception if required AWS credentials are missing.
         """
-        if not S3Client._s3_client or not S3Client._s3_resource:
-            self._initialize_s3_connection(region_name)
-
-        self.s3_client = S3Client._s3_client
-        self.s3_resource = S3Client._s3_resource
-
-    @classmethod
-    def _initialize_s3_connection(cls, region_name: str):
-        """Sets up the S3 client and resource if not already initialized."""
-        log.info("Initializing AWS S3 connection...")
-
-        access_key_id = os.getenv(AWS_ACCESS_KEY_ID_ENV_KEY)
-        secret_access_key = os.getenv(AWS_SECRET_ACCESS_KEY_ENV_KEY)
-
-        if not access_key_id:
-            raise ValueError(f"Missing environment variable: {AWS_ACCESS_KEY_ID_ENV_KEY}")
-        if not secret_access_key:
-            raise ValueError(f"Missing environment variable: {AWS_SECRET_ACCESS_KEY_ENV_KEY}")
-
-        try:
-            cls._s3_resource = boto3.resource(
-                's3',
-                aws_access_key_id=access_key_id,
-                aws_secret_access_key=secret_access_key,
-                region_name=region_name
-            )
-            cls._s3_client = boto3.client(
-                's3',
-                aws_access_key_id=access_key_id,
-                aws_secret_access_key=secret_access_key,
-                region_name=region_name
-            )
-            log.info("AWS S3 connection established successfully.")
-
-        except Exception as e:
-            log.error(f"Failed to initialize AWS S3 connection: {str(e)}", exc_info=True)
-            raise RuntimeError("AWS S3 initialization failed. Check credentials and network.") from e
+        self.s3_resource, self.s3_client = _get_s3_client(region_name)
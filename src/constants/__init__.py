@@ -5,9 +5,15 @@ from datetime import date
 DATABASE_NAME = "MLOPS"
 COLLECTION_NAME = "VehicleInsuranceData"
 MONGODB_URL_KEY = "MONGO_DB_URL"
+MONGODB_BATCH_SIZE: int = 10_000
 
 PIPELINE_NAME: str = "Pipeline"
 ARTIFACT_DIR: str = "artifact"
+# Stage results reused across runs when their inputs are unchanged
+ARTIFACT_CACHE_DIR: str = os.path.join(ARTIFACT_DIR, "cache")
+ARTIFACT_CACHE_MAX_ENTRIES: int = 8
+# Set ARTIFACT_CACHE_DISABLED=true to rerun every stage instead of reusing cached artifacts
+ARTIFACT_CACHE_DISABLED: bool = os.getenv("ARTIFACT_CACHE_DISABLED", "false").lower() == "true"
 
 MODEL_FILE_NAME = "model.pkl"
 
@@ -16,8 +22,8 @@ CURRENT_YEAR = date.today().year
 PREPROCSSING_OBJECT_FILE_NAME = "preprocessing.pkl"
 
 FILE_NAME: str = "data.csv"
-TRAIN_FILE_NAME: str = "train.csv"
-TEST_FILE_NAME: str = "test.csv"
+TRAIN_FILE_NAME: str = "train.parquet"
+TEST_FILE_NAME: str = "test.parquet"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 
 
@@ -25,6 +31,35 @@ AWS_ACCESS_KEY_ID_ENV_KEY = "AWS_ACCESS_KEY_ID"
 AWS_SECRET_ACCESS_KEY_ENV_KEY = "AWS_SECRET_ACCESS_KEY"
 REGION_NAME = "us-east-1"
 
+# Byte-range download tuning for large S3 objects
+S3_DOWNLOAD_PART_SIZE: int = 16 * 1024 * 1024
+S3_DOWNLOAD_CONCURRENCY: int = 8
+# Full restarts allowed when the object's ETag changes between ranged GETs
+S3_DOWNLOAD_ETAG_ATTEMPTS: int = 3
+S3_MAX_POOL_CONNECTIONS: int = 64
+S3_MAX_RETRY_ATTEMPTS: int = 10
+# Transfer Acceleration must be enabled on the bucket, so it is opt-in
+S3_USE_ACCELERATE_ENDPOINT: bool = os.getenv("S3_USE_ACCELERATE_ENDPOINT", "false").lower() == "true"
+S3_UPLOAD_CHUNK_SIZE: int = 16 * 1024 * 1024
+S3_UPLOAD_CONCURRENCY: int = 16
+S3_UPLOAD_MAX_IO_QUEUE: int = 1000
+
+
+# Levels of the categorical source columns, shared by data transformation and model evaluation
+CATEGORY_LEVELS = {
+    "Gender": ["Female", "Male"],
+    "Vehicle_Age": ["< 1 Year", "1-2 Year", "> 2 Years"],
+    "Vehicle_Damage": ["No", "Yes"],
+}
+# Model features encoded from those columns: feature -> (source column, level encoded as 1);
+# Gender is encoded in place, the others are dummy columns replacing their source
+ENCODED_FEATURES = {
+    "Gender": ("Gender", "Male"),
+    "Vehicle_Age_lt_1_Year": ("Vehicle_Age", "< 1 Year"),
+    "Vehicle_Age_gt_2_Years": ("Vehicle_Age", "> 2 Years"),
+    "Vehicle_Damage_Yes": ("Vehicle_Damage", "Yes"),
+}
+
 
 """
 Data Ingestion related constant start with DATA_INGESTION VAR NAME
@@ -34,6 +69,7 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.25
+DATA_INGESTION_PARQUET_ROW_GROUP_SIZE: int = 200_000
 
 """
 Data Validation realted contant start with DATA_VALIDATION VAR NAME
@@ -47,6 +83,7 @@ Data Transformation ralated constant start with DATA_TRANSFORMATION VAR NAME
 DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
+DATA_TRANSFORMATION_READ_BATCH_SIZE: int = 200_000
 
 """
 MODEL TRAINER related constant start with MODEL_TRAINER var name
@@ -67,6 +104,7 @@ MIN_SAMPLES_SPLIT_RANDOM_STATE: int = 101
 MODEL Evaluation related constants
 """
 MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE: float = 0.02
+MODEL_EVALUATION_PREDICT_BATCH_SIZE: int = 8192
 MODEL_BUCKET_NAME = "vehicleinsurance-proj-model"
 MODEL_PUSHER_S3_KEY = "model-registry"
 
@@ -2,11 +2,14 @@ import sys
 import pandas as pd
 import numpy as np
 from typing import Optional
+from pymongoarrow.api import Schema, find_pandas_all
 
 from src.configuration.mongo_db_connection import MongoDBClient
-from src.constants import DATABASE_NAME
+from src.constants import DATABASE_NAME, MONGODB_BATCH_SIZE
 from src.exception import CustomException
 from src.logger import log
+from src.utils.main_utils import read_schema_arrow_types
+
 
 class VehicleInsuranceData:
     """
@@ -51,16 +54,35 @@ class VehicleInsuranceData:
 
             log.info(f"Fetching data from MongoDB | Database: {db_name}, Collection: {collection_name}")
             
-            # Convert MongoDB collection to DataFrame
-            df = pd.DataFrame(list(collection.find()))
+            fields = read_schema_arrow_types()
+            # The schema projection hides fields the source has but schema.yaml lacks, so report them here
+            sample = collection.find_one({}, {"_id": 0})
+            extra_fields = sorted(set(sample or ()) - set(fields))
+            if extra_fields:
+                log.warning(f"Fields not in schema.yaml are left out of the export: {extra_fields}")
+
+            # Stream the collection into a columnar DataFrame without building a list of dicts;
+            # the schema projects away `_id` server-side and large batches cut getMore round-trips.
+            # allow_invalid turns values that don't match the schema (e.g. "na" in a numeric field) into nulls
+            df = find_pandas_all(collection, {}, schema=Schema(fields), batch_size=MONGODB_BATCH_SIZE,
+                                 allow_invalid=True)
             log.info(f"Data fetched successfully | Records: {len(df)}")
 
-            # Remove MongoDB's default `_id` column
-            if "_id" in df.columns:
-                df.drop(columns=["_id"], inplace=True)
+            # Missing or mistyped fields come back as nulls rather than errors, so surface them
+            null_counts = df.isna().sum()
+            null_counts = null_counts[null_counts > 0]
+            if len(null_counts):
+                log.warning(f"Null values per column after schema coercion: {null_counts.to_dict()}")
+            empty_columns = null_counts[null_counts == len(df)].index.tolist()
+            if len(df) and empty_columns:
+                raise ValueError(f"Columns missing or mistyped for every document in '{collection_name}': {empty_columns}")
 
-            # Replace "na" with NaN for proper handling of missing values
-            df.replace({"na": np.nan}, inplace=True)
+            # Replace "na" with NaN for proper handling of missing values; only string columns can hold
+            # the literal, numeric fields with a mismatched type already arrive as nulls from the schema.
+            # pandas 3 gives Arrow string columns the `str` dtype rather than `object`, so match both
+            obj_cols = df.select_dtypes(include=["object", "string"]).columns
+            if len(obj_cols):
+                df[obj_cols] = df[obj_cols].replace({"na": np.nan})
 
             return df
 
@@ -23,6 +23,7 @@ class ClassificationMetricArtifact:
     f1_score:float
     precision_score:float
     recall_score:float
+    accuracy_score:float
 
 @dataclass
 class ModelTrainerArtifact:
@@ -1,6 +1,6 @@
 import sys
+import numpy as np
 import pandas as pd
-from pandas import DataFrame
 from sklearn.pipeline import Pipeline
 
 from src.exception import CustomException
@@ -13,6 +13,7 @@ class TargetValueMapping:
     """
     def __init__(self):
         self.mapping = {"yes": 0, "no": 1}
+        self._reverse = {v: k for k, v in self.mapping.items()}
 
     def _asdict(self) -> dict:
         """
@@ -24,7 +25,7 @@ class TargetValueMapping:
         """
         Returns a reversed dictionary to map numeric values back to original categories.
         """
-        return {v: k for k, v in self.mapping.items()}
+        return self._reverse
 
 
 class MyModel:
@@ -39,26 +40,40 @@ class MyModel:
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
 
-    def predict(self, dataframe: pd.DataFrame) -> DataFrame:
+    def predict(self, dataframe: pd.DataFrame, batch_size: int = 0) -> np.ndarray:
         """
         Applies preprocessing transformations and predicts target values.
 
         :param dataframe: Input DataFrame containing features.
+        :param batch_size: If positive, transform and predict in slices of this many rows to bound memory.
         :return: Array of predicted values.
         """
         try:
-            log.info("Starting prediction process.")
+            # Called once per mini-batch, so per-call messages stay at debug level
+            log.debug("Starting prediction process.")
 
             if dataframe.empty:
                 log.warning("Received an empty DataFrame for prediction.")
                 raise ValueError("Input DataFrame is empty. Prediction aborted.")
 
+            n_rows = len(dataframe)
+            if batch_size > 0 and n_rows > batch_size:
+                # Stream slices through transform + predict into a single preallocated output
+                log.debug("Predicting %s rows in batches of %s.", n_rows, batch_size)
+                # Same dtype as the single-pass path, so batching doesn't change the output type
+                predictions = np.empty(n_rows, dtype=self.trained_model_object.classes_.dtype)
+                for start in range(0, n_rows, batch_size):
+                    batch = dataframe.iloc[start:start + batch_size]
+                    predictions[start:start + batch_size] = self.trained_model_object.predict(
+                        self.preprocessing_object.transform(batch))
+                return predictions
+
             # Apply preprocessing transformations
-            log.info("Applying preprocessing transformations.")
+            log.debug("Applying preprocessing transformations.")
             transformed_features = self.preprocessing_object.transform(dataframe)
 
             # Make predictions
-            log.info("Generating predictions using the trained model.")
+            log.debug("Generating predictions using the trained model.")
             predictions = self.trained_model_object.predict(transformed_features)
 
             return predictions
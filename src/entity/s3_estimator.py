@@ -1,11 +1,26 @@
 import sys
 import logging
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
 from pandas import DataFrame
-from src.cloud_storage.aws_storage import SimpleStorageService
+from src.cloud_storage.aws_storage import get_s3_storage
 from src.exception import CustomException
 from src.logger import log
 from src.entity.estimator import MyModel
 
+@lru_cache(maxsize=1)
+def _prefetch_executor() -> ThreadPoolExecutor:
+    """Creates the background pool for model downloads the first time a prefetch is started."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+@lru_cache(maxsize=4)
+def _cached_load(bucket_name: str, model_path: str) -> MyModel:
+    """Downloads and deserializes a model once per process for each (bucket, path)."""
+    return get_s3_storage().load_model(model_path, bucket_name=bucket_name)
+
 
 class ProjEstimator:
     """
@@ -22,8 +37,9 @@ class ProjEstimator:
         """
         self.bucket_name = bucket_name
         self.model_path = model_path
-        self.s3 = SimpleStorageService()
+        self.s3 = get_s3_storage()
         self.loaded_model: MyModel = None
+        self._model_future: Future = None
 
     def is_model_present(self, model_path: str) -> bool:
         """
@@ -41,17 +57,32 @@ class ProjEstimator:
             log.error(f"Error checking model presence in S3: {e}")
             return False
 
+    def prefetch_model(self) -> Optional[Future]:
+        """
+        Starts downloading the model in the background so a later load_model only waits for it.
+
+        Returns:
+            Optional[Future]: The pending download, or None if the model is already loaded.
+        """
+        if self.loaded_model is None and self._model_future is None:
+            self._model_future = _prefetch_executor().submit(_cached_load, self.bucket_name, self.model_path)
+        return self._model_future
+
     def load_model(self) -> MyModel:
         """
-        Loads the model from the S3 bucket.
+        Loads the model from the S3 bucket, reusing a pending prefetch if one was started.
 
         Returns:
             MyModel: The loaded model.
         """
         try:
             if self.loaded_model is None:
-                self.loaded_model = self.s3.load_model(self.model_path, bucket_name=self.bucket_name)
-                log.info(f"Model loaded successfully from {self.model_path}")
+                if self._model_future is not None:
+                    future, self._model_future = self._model_future, None
+                    self.loaded_model = future.result()
+                else:
+                    self.loaded_model = _cached_load(self.bucket_name, self.model_path)
+                log.info("Model loaded successfully from %s", self.model_path)
             return self.loaded_model
         except Exception as e:
             raise CustomException(f"Error loading model from {self.model_path}: {e}", sys)
@@ -71,23 +102,26 @@ class ProjEstimator:
                 bucket_name=self.bucket_name,
                 remove=remove
             )
+            # The stored model changed, so drop any cached copy
+            _cached_load.cache_clear()
             log.info(f"Model uploaded to {self.model_path} in {self.bucket_name}")
         except Exception as e:
             raise CustomException(f"Error saving model to S3: {e}", sys)
 
-    def predict(self, dataframe: DataFrame) -> DataFrame:
+    def predict(self, dataframe: DataFrame, batch_size: int = 0) -> np.ndarray:
         """
         Uses the loaded model to make predictions on the provided DataFrame.
 
         Args:
             dataframe (DataFrame): Input data for prediction.
+            batch_size (int, optional): Rows per prediction batch; 0 predicts in one pass. Defaults to 0.
 
         Returns:
-            DataFrame: Model predictions.
+            np.ndarray: Model predictions.
         """
         try:
             if self.loaded_model is None:
                 self.load_model()
-            return self.loaded_model.predict(dataframe=dataframe)
+            return self.loaded_model.predict(dataframe=dataframe, batch_size=batch_size)
         except Exception as e:
             raise CustomException(f"Error during prediction: {e}", sys)
@@ -1,4 +1,6 @@
 import sys
+from functools import wraps
+from typing import Optional
 from src.exception import CustomException
 from src.logger import log
 
@@ -6,8 +8,10 @@ from src.components.data_ingestion import DataIngestion
 from src.components.data_validation import DataValidation
 from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
-from src.components.model_evaluation import ModelEvaluation
+from src.components.model_evaluation import ModelEvaluation, find_production_model
 from src.components.model_pusher import ModelPusher
+from src.entity.s3_estimator import ProjEstimator
+from src.utils.main_utils import cached_stage
 
 from src.entity.config_entity import (DataIngestionConfig,
                                           DataValidationConfig,
@@ -24,6 +28,20 @@ from src.entity.artifact_entity import (DataIngestionArtifact,
                                             ModelPusherArtifact)
 
 
+def _stage(fn):
+    """
+    Wraps a pipeline stage so any failure is logged with its traceback and surfaces as a CustomException,
+    in place of a try/except per method.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            log.exception(f"{fn.__name__} failed")
+            raise CustomException(e, sys) from e
+    return wrapper
+
 
 class TrainPipeline:
     def __init__(self):
@@ -36,22 +54,21 @@ class TrainPipeline:
 
 
     
+    @_stage
     def start_data_ingestion(self) -> DataIngestionArtifact:
         """
         This method of TrainPipeline class is responsible for starting data ingestion component
         """
-        try:
-            log.info("Entered the start_data_ingestion method of TrainPipeline class")
-            log.info("Getting the data from mongodb")
-            data_ingestion = DataIngestion(data_ingestion_config=self.data_ingestion_config)
-            data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
-            log.info("Got the train_set and test_set from mongodb")
-            log.info("Exited the start_data_ingestion method of TrainPipeline class")
-            return data_ingestion_artifact
-        except Exception as e:
-            raise CustomException(e, sys) from e
+        log.info("Entered the start_data_ingestion method of TrainPipeline class")
+        log.info("Getting the data from mongodb")
+        data_ingestion = DataIngestion(data_ingestion_config=self.data_ingestion_config)
+        data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
+        log.info("Got the train_set and test_set from mongodb")
+        log.info("Exited the start_data_ingestion method of TrainPipeline class")
+        return data_ingestion_artifact
         
 
+    @_stage
     def start_data_validation(self, data_ingestion_artifact: DataIngestionArtifact) -> DataValidationArtifact:
         """
         Starts the data validation process as part of the TrainPipeline.
@@ -64,19 +81,16 @@ class TrainPipeline:
         """
         log.info("Starting data validation in TrainPipeline...")
 
-        try:
-            data_validation = DataValidation(
-                data_ingestion_artifact=data_ingestion_artifact,
-                data_validation_config=self.data_validation_config
-            )
-
-            log.info("Initializing data validation process.")
-            return data_validation.initiate_data_validation()
+        data_validation = DataValidation(
+            data_ingestion_artifact=data_ingestion_artifact,
+            data_validation_config=self.data_validation_config
+        )
 
-        except Exception as e:
-            log.error(f"Error occurred during data validation: {e}", exc_info=True)
-            raise CustomException(e, sys) from e
+        log.info("Initializing data validation process.")
+        return data_validation.initiate_data_validation()
         
+    @cached_stage("data_transformation")
+    @_stage
     def start_data_transformation(self, data_ingestion_artifact: DataIngestionArtifact, 
                               data_validation_artifact: DataValidationArtifact) -> DataTransformationArtifact:
         """
@@ -91,66 +105,54 @@ class TrainPipeline:
         """
         log.info("Starting data transformation process.")
 
-        try:
-            # Initialize data transformation
-            data_transformation = DataTransformation(
-                data_ingestion_artifact=data_ingestion_artifact,
-                data_transformation_config=self.data_transformation_config,
-                data_validation_artifact=data_validation_artifact
-            )
-            log.info("DataTransformation instance created successfully.")
-
-            # Perform data transformation
-            data_transformation_artifact = data_transformation.initiate_data_transformation()
-            log.info("Data transformation completed successfully.")
+        # Initialize data transformation
+        data_transformation = DataTransformation(
+            data_ingestion_artifact=data_ingestion_artifact,
+            data_transformation_config=self.data_transformation_config,
+            data_validation_artifact=data_validation_artifact
+        )
+        log.info("DataTransformation instance created successfully.")
 
-            return data_transformation_artifact
+        # Perform data transformation
+        data_transformation_artifact = data_transformation.initiate_data_transformation()
+        log.info("Data transformation completed successfully.")
 
-        except Exception as e:
-            log.exception("Error occurred during data transformation.")
-            raise CustomException(e, sys) from e
+        return data_transformation_artifact
         
 
+    @cached_stage("model_trainer")
+    @_stage
     def start_model_trainer(self, data_transformation_artifact: DataTransformationArtifact) -> ModelTrainerArtifact:
-            """
-            This method of TrainPipeline class is responsible for starting model training
-            """
-            try:
-                model_trainer = ModelTrainer(data_transformation_artifact=data_transformation_artifact,
-                                            model_trainer_config=self.model_trainer_config
-                                            )
-                model_trainer_artifact = model_trainer.initiate_model_trainer()
-                return model_trainer_artifact
-
-            except Exception as e:
-                raise CustomException(e, sys)
+        """
+        This method of TrainPipeline class is responsible for starting model training
+        """
+        model_trainer = ModelTrainer(data_transformation_artifact=data_transformation_artifact,
+                                     model_trainer_config=self.model_trainer_config
+                                     )
+        return model_trainer.initiate_model_trainer()
             
+    @_stage
     def start_model_evaluation(self, data_ingestion_artifact: DataIngestionArtifact,
-                               model_trainer_artifact: ModelTrainerArtifact) -> ModelEvaluationArtifact:
+                               model_trainer_artifact: ModelTrainerArtifact,
+                               best_model: Optional[ProjEstimator] = None) -> ModelEvaluationArtifact:
         """
         This method of TrainPipeline class is responsible for starting modle evaluation
         """
-        try:
-            model_evaluation = ModelEvaluation(model_eval_config=self.model_evaluation_config,
-                                               data_ingestion_artifact=data_ingestion_artifact,
-                                               model_trainer_artifact=model_trainer_artifact)
-            model_evaluation_artifact = model_evaluation.initiate_model_evaluation()
-            return model_evaluation_artifact
-        except Exception as e:
-            raise CustomException(e, sys)
+        model_evaluation = ModelEvaluation(model_eval_config=self.model_evaluation_config,
+                                           data_ingestion_artifact=data_ingestion_artifact,
+                                           model_trainer_artifact=model_trainer_artifact,
+                                           best_model=best_model)
+        return model_evaluation.initiate_model_evaluation()
         
+    @_stage
     def start_model_pusher(self, model_evaluation_artifact: ModelEvaluationArtifact) -> ModelPusherArtifact:
         """
         This method of TrainPipeline class is responsible for starting model pushing
         """
-        try:
-            model_pusher = ModelPusher(model_evaluation_artifact=model_evaluation_artifact,
-                                       model_pusher_config=self.model_pusher_config
-                                       )
-            model_pusher_artifact = model_pusher.initiate_model_pusher()
-            return model_pusher_artifact
-        except Exception as e:
-            raise CustomException(e, sys)
+        model_pusher = ModelPusher(model_evaluation_artifact=model_evaluation_artifact,
+                                   model_pusher_config=self.model_pusher_config
+                                   )
+        return model_pusher.initiate_model_pusher()
 
 
         
@@ -161,12 +163,16 @@ class TrainPipeline:
         """
         try:
             data_ingestion_artifact = self.start_data_ingestion()
+            # Look up the production model now; its download runs in the background while the local
+            # stages run, and a failing stage raises without waiting for it
+            best_model = find_production_model(self.model_evaluation_config)
             data_validation_artifact = self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
             data_transformation_artifact = self.start_data_transformation(
                 data_ingestion_artifact=data_ingestion_artifact, data_validation_artifact=data_validation_artifact)
             model_trainer_artifact = self.start_model_trainer(data_transformation_artifact=data_transformation_artifact)
             model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingestion_artifact,
-                                                                    model_trainer_artifact=model_trainer_artifact)
+                                                                    model_trainer_artifact=model_trainer_artifact,
+                                                                    best_model=best_model)
             if not model_evaluation_artifact.is_model_accepted:
                 log.info(f"Model not accepted.")
                 return None
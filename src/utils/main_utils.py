@@ -1,17 +1,50 @@
 import os
 import sys
-import dill
+import json
+import pickle
+import hashlib
+import joblib
 import yaml
+import inspect
+import dataclasses
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, get_type_hints
 import numpy as np
+import pyarrow as pa
 from pandas import DataFrame
 
+from src.constants import ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_MAX_ENTRIES, ARTIFACT_CACHE_DISABLED, SCHEMA_FILE_PATH
+from src.entity.config_entity import training_pipeline_config
 from src.exception import CustomException
 from src.logger import log
 
+# libyaml-backed loader and dumper when PyYAML was built with them, otherwise the pure-Python ones
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+
+
+@lru_cache(maxsize=None)
+def _ensure_dir(dir_path: str) -> None:
+    """
+    Creates a directory tree once per process; later calls for the same directory make no syscalls.
+    """
+    Path(dir_path).mkdir(parents=True, exist_ok=True)
+
+
+@lru_cache(maxsize=32)
+def _read_yaml_cached(file_path: str, mtime: float) -> dict:
+    """
+    Parses a YAML file once per (path, mtime), so repeated reads of an unchanged file skip parsing.
+    """
+    with open(file_path, "r", encoding="utf-8") as yaml_file:
+        return yaml.load(yaml_file, Loader=_YAML_LOADER)
+
 
 def read_yaml_file(file_path: str) -> dict:
     """
     Reads a YAML file and returns its contents as a dictionary.
+    Repeated reads of an unchanged file return the cached result, which callers should not mutate.
 
     Parameters:
     ----------
@@ -25,12 +58,34 @@ def read_yaml_file(file_path: str) -> dict:
     """
     try:
         log.info(f"Reading YAML file from {file_path}")
-        with open(file_path, "r", encoding="utf-8") as yaml_file:
-            return yaml.safe_load(yaml_file)
+        return _read_yaml_cached(file_path, os.path.getmtime(file_path))
     except Exception as e:
         raise CustomException(e, sys) from e
 
 
+# Arrow types for the column kinds used in schema.yaml
+_ARROW_TYPES = {"int": pa.int32(), "float": pa.float64(), "category": pa.string()}
+
+
+def read_schema_arrow_types(file_path: str = SCHEMA_FILE_PATH) -> Dict[str, pa.DataType]:
+    """
+    Maps each column listed under `columns` in the schema file to its Arrow type, so every reader and
+    writer of the source data uses the same column types.
+
+    Parameters:
+    ----------
+    file_path : str, optional
+        Path to the schema YAML file. Defaults to SCHEMA_FILE_PATH.
+
+    Returns:
+    -------
+    Dict[str, pa.DataType]
+        Column name to Arrow type, in schema order.
+    """
+    columns = read_yaml_file(file_path=file_path)["columns"]
+    return {name: _ARROW_TYPES[kind] for column in columns for name, kind in column.items()}
+
+
 def write_yaml_file(file_path: str, content: object, replace: bool = False) -> None:
     """
     Writes content to a YAML file.
@@ -48,16 +103,30 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
         log.info(f"Writing YAML file to {file_path}")
         if replace and os.path.exists(file_path):
             os.remove(file_path)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        _ensure_dir(os.path.dirname(file_path))
         with open(file_path, "w", encoding="utf-8") as file:
-            yaml.dump(content, file, default_flow_style=False)
+            yaml.dump(content, file, Dumper=_YAML_DUMPER, default_flow_style=False, sort_keys=False)
     except Exception as e:
         raise CustomException(e, sys) from e
 
 
+# Objects saved by this process, keyed by path with the (mtime, size) they were written with
+_OBJECT_CACHE: Dict[str, Tuple[float, int, object]] = {}
+
+
+@lru_cache(maxsize=8)
+def _load_object_cached(file_path: str, mtime: float, size: int) -> object:
+    """
+    Deserializes a file once per (path, mtime, size), so an unchanged file is not unpickled again.
+    NumPy arrays inside the object are memory-mapped read-only rather than copied into memory.
+    """
+    return joblib.load(file_path, mmap_mode="r")
+
+
 def load_object(file_path: str) -> object:
     """
     Loads and returns a serialized object from a file.
+    Objects saved earlier in this process, and repeated loads of an unchanged file, return the cached object.
 
     Parameters:
     ----------
@@ -73,15 +142,19 @@ def load_object(file_path: str) -> object:
         log.info(f"Loading object from {file_path}")
         if not os.path.exists(file_path):
             raise CustomException(f"File not found: {file_path}", sys)
-        with open(file_path, "rb") as file_obj:
-            return dill.load(file_obj)
+        stat = os.stat(file_path)
+        saved = _OBJECT_CACHE.get(file_path)
+        if saved is not None and saved[:2] == (stat.st_mtime, stat.st_size):
+            # Written by save_object in this process and unchanged since, so skip deserializing it
+            return saved[2]
+        return _load_object_cached(file_path, stat.st_mtime, stat.st_size)
     except Exception as e:
         raise CustomException(e, sys) from e
 
 
 def save_object(file_path: str, obj: object) -> None:
     """
-    Saves an object using dill serialization.
+    Saves an object using joblib serialization, uncompressed so its arrays can be memory-mapped on load.
 
     Parameters:
     ----------
@@ -93,9 +166,11 @@ def save_object(file_path: str, obj: object) -> None:
     log.info(f"Saving object to {file_path}")
 
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file_obj:
-            dill.dump(obj, file_obj)
+        _ensure_dir(os.path.dirname(file_path))
+        joblib.dump(obj, file_path, compress=0, protocol=pickle.HIGHEST_PROTOCOL)
+        # Keep the live object so a later load in this process can hand it back directly
+        stat = os.stat(file_path)
+        _OBJECT_CACHE[file_path] = (stat.st_mtime, stat.st_size, obj)
 
         log.info(f"Object successfully saved to {file_path}")
 
@@ -103,9 +178,9 @@ def save_object(file_path: str, obj: object) -> None:
         raise CustomException(e, sys) from e
 
 
-def save_numpy_array_data(file_path: str, array: np.ndarray) -> None:
+def save_numpy_array_data(file_path: str, array: np.ndarray, dtype: Optional[np.dtype] = None) -> None:
     """
-    Saves a NumPy array to a file.
+    Saves a NumPy array to a file. float64 arrays are stored as float32 to halve the bytes written and read.
 
     Parameters:
     ----------
@@ -113,11 +188,17 @@ def save_numpy_array_data(file_path: str, array: np.ndarray) -> None:
         Path where the NumPy array will be saved.
     array : np.ndarray
         The NumPy array to save.
+    dtype : np.dtype, optional
+        Explicit dtype to store instead of the default downcast. Defaults to None.
     """
     try:
         log.info(f"Saving NumPy array to {file_path}")
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        np.save(file_path, array, allow_pickle=True)
+        _ensure_dir(os.path.dirname(file_path))
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+        elif array.dtype == np.float64:
+            array = array.astype(np.float32, copy=False)
+        np.save(file_path, array, allow_pickle=False)
         log.info(f"NumPy array successfully saved to {file_path}")
 
     except Exception as e:
@@ -126,7 +207,9 @@ def save_numpy_array_data(file_path: str, array: np.ndarray) -> None:
 
 def load_numpy_array_data(file_path: str) -> np.ndarray:
     """
-    Loads a NumPy array from a file.
+    Loads a NumPy array from a file as a read-only memory map; pages are read in on access.
+    Callers that need to modify the data should take an explicit copy with np.array(arr).
+    Float data is stored as float32, so estimators that require float64 need an explicit astype(np.float64).
 
     Parameters:
     ----------
@@ -142,6 +225,140 @@ def load_numpy_array_data(file_path: str) -> np.ndarray:
         log.info(f"Loading NumPy array from {file_path}")
         if not os.path.exists(file_path):
             raise CustomException(f"File not found: {file_path}", sys)
-        return np.load(file_path, allow_pickle=True)
+        return np.load(file_path, mmap_mode="r", allow_pickle=False)
     except Exception as e:
         raise CustomException(e, sys) from e
+
+
+def _file_digest(file_path: str) -> str:
+    """
+    Returns the BLAKE2b digest of a file's contents, read in 1 MiB blocks.
+    """
+    digest = hashlib.blake2b()
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Marker for output locations of the current run, which are excluded from stage fingerprints
+_RUN_OUTPUT = object()
+
+
+def _fingerprint(value: object, output_dir: str) -> object:
+    """
+    Reduces a config or artifact to JSON-friendly values for hashing. Existing files are replaced by
+    their content digest; paths that are yet to be written under the current run's output directory
+    are left out, since they change on every run.
+    """
+    if dataclasses.is_dataclass(value):
+        # Include plain class attributes too, since some configs keep their settings outside dataclass fields
+        attrs = {k: v for k, v in vars(type(value)).items() if not k.startswith("__") and not callable(v)}
+        attrs.update(vars(value))
+        fingerprints = {k: _fingerprint(v, output_dir) for k, v in attrs.items()}
+        return {k: v for k, v in fingerprints.items() if v is not _RUN_OUTPUT}
+    if isinstance(value, str):
+        if os.path.isfile(value):
+            return _file_digest(value)
+        if value.startswith(output_dir):
+            return _RUN_OUTPUT
+    return value
+
+
+def _artifact_from_dict(cls: type, data: dict) -> object:
+    """
+    Rebuilds an artifact dataclass, including nested artifact fields, from its asdict form.
+    """
+    hints = get_type_hints(cls)
+    return cls(**{k: _artifact_from_dict(hints[k], v) if dataclasses.is_dataclass(hints[k]) else v
+                  for k, v in data.items()})
+
+
+@lru_cache(maxsize=1)
+def _source_digest() -> str:
+    """
+    Returns one digest over every Python source file of the `src` package, computed once per process,
+    so any change to the code that produces a stage's output (constants included) invalidates its cache.
+    """
+    package_dir = Path(__file__).resolve().parents[1]
+    digest = hashlib.blake2b()
+    for source in sorted(package_dir.rglob("*.py")):
+        digest.update(str(source.relative_to(package_dir)).encode())
+        digest.update(_file_digest(str(source)).encode())
+    return digest.hexdigest()
+
+
+def cached_stage(stage_name: str) -> Callable:
+    """
+    Decorates a TrainPipeline `start_*` method so it reuses a previous run's artifact when the stage's
+    config (`self.<stage_name>_config`), its input artifacts, the schema and the `src` source code are unchanged.
+    Setting ARTIFACT_CACHE_DISABLED=true in the environment always runs the stage.
+
+    Parameters:
+    ----------
+    stage_name : str
+        Name of the stage; also selects the config attribute and the cache sub-directory.
+
+    Returns:
+    -------
+    Callable
+        The decorator.
+    """
+    def decorator(fn: Callable) -> Callable:
+        artifact_cls = get_type_hints(fn)["return"]
+        signature = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            if ARTIFACT_CACHE_DISABLED:
+                return fn(self, *args, **kwargs)
+
+            cache_file = None
+            try:
+                artifacts = signature.bind(self, *args, **kwargs).arguments
+                artifacts.pop("self")
+                output_dir = training_pipeline_config.artifact_dir
+                inputs = {
+                    "config": _fingerprint(getattr(self, f"{stage_name}_config"), output_dir),
+                    "artifacts": {k: _fingerprint(v, output_dir) for k, v in sorted(artifacts.items())},
+                    "schema": _file_digest(SCHEMA_FILE_PATH),
+                    "code": _source_digest(),
+                }
+                key = hashlib.blake2b(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+                cache_dir = os.path.join(ARTIFACT_CACHE_DIR, stage_name)
+                cache_file = os.path.join(cache_dir, f"{key}.json")
+
+                if os.path.exists(cache_file):
+                    with open(cache_file, "r", encoding="utf-8") as file_obj:
+                        artifact_data = json.load(file_obj)
+                    # Only trust the entry while every file it points to still exists
+                    paths = [v for v in artifact_data.values() if isinstance(v, str) and os.sep in v]
+                    if all(os.path.exists(p) for p in paths):
+                        os.utime(cache_file)
+                        log.info("Reusing cached %s artifact %s", stage_name, key)
+                        return _artifact_from_dict(artifact_cls, artifact_data)
+            except Exception:
+                # A broken cache only costs a rerun of the stage
+                log.exception("Artifact cache lookup failed for %s", stage_name)
+                cache_file = None
+
+            artifact = fn(self, *args, **kwargs)
+            if cache_file is None:
+                return artifact
+
+            try:
+                _ensure_dir(cache_dir)
+                with open(cache_file, "w", encoding="utf-8") as file_obj:
+                    json.dump(dataclasses.asdict(artifact), file_obj)
+
+                # Evict the least recently used entries beyond the limit
+                entries = sorted((os.path.join(cache_dir, name) for name in os.listdir(cache_dir)),
+                                 key=os.path.getmtime, reverse=True)
+                for stale in entries[ARTIFACT_CACHE_MAX_ENTRIES:]:
+                    os.remove(stale)
+            except Exception:
+                log.exception("Artifact cache store failed for %s", stage_name)
+            return artifact
+
+        return wrapper
+    return decorator
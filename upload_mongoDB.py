@@ -1,13 +1,18 @@
 import os
 import sys
-import json
+import atexit
 import certifi
-import pandas as pd
-import numpy as np
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow.csv as pacsv
 import pymongo
+from functools import lru_cache
+from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
 from src.exception import CustomException
 from src.logger import log
+from src.utils.main_utils import read_schema_arrow_types
 
 # Load environment variables
 load_dotenv(dotenv_path=".env")
@@ -16,6 +21,22 @@ load_dotenv(dotenv_path=".env")
 MONGO_DB_URL = os.getenv("MONGO_DB_URL")
 CA_CERT = certifi.where()
 
+CSV_BLOCK_SIZE = 64 << 20
+MONGO_MAX_POOL_SIZE = 50
+MONGO_INSERT_BATCH_SIZE = 1000
+MONGO_INSERT_WORKERS = 4
+MONGO_MAX_PENDING_CHUNKS = 8
+MONGO_LOGGED_WRITE_ERRORS = 5
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> pymongo.MongoClient:
+    """Creates the process-wide MongoDB client once; it is pooled across ETL jobs and closed at exit."""
+    client = pymongo.MongoClient(MONGO_DB_URL, tlsCAFile=CA_CERT, maxPoolSize=MONGO_MAX_POOL_SIZE,
+                                 w=1, retryWrites=True)
+    atexit.register(client.close)
+    return client
+
 
 class VehicleInsuranceETL:
     def __init__(self):
@@ -24,25 +45,88 @@ class VehicleInsuranceETL:
             if not MONGO_DB_URL:
                 raise ValueError("MongoDB URL is missing in environment variables.")
             
-            self.client = pymongo.MongoClient(MONGO_DB_URL,tlsCAFile=certifi.where())
+            self.client = _get_client()
 
             log.info("MongoDB connection established successfully.")
         except Exception as e:
             raise CustomException(e, sys)
 
-    def csv_to_json(self, path: str) -> list:
-        """Converts a CSV file to a list of JSON records."""
+    def _insert_records(self, col, records: list) -> int:
+        """Inserts records in unordered batches and returns how many were written; failed documents are logged."""
+        inserted = 0
+        for start in range(0, len(records), MONGO_INSERT_BATCH_SIZE):
+            batch = records[start:start + MONGO_INSERT_BATCH_SIZE]
+            try:
+                result = col.insert_many(batch, ordered=False, bypass_document_validation=True)
+                inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                # Unordered inserts keep going past bad documents; record them instead of failing the load
+                inserted += e.details["nInserted"]
+                # Each write error embeds the whole failing document, so only a short summary is logged
+                errors = e.details["writeErrors"]
+                sample = [(err["index"], err["errmsg"]) for err in errors[:MONGO_LOGGED_WRITE_ERRORS]]
+                log.error(f"{len(errors)} documents failed to insert; first errors (batch index, message): {sample}")
+        return inserted
+
+    @contextmanager
+    def _without_secondary_indexes(self, col):
+        """Drops non-constraint secondary indexes for the duration of a bulk load and rebuilds them afterwards.
+        Unique and partial indexes stay in place, since they enforce rules the inserted documents must obey."""
+        # Full index documents from listIndexes, so text weights, collations, TTLs etc. survive the rebuild
+        indexes = {spec["name"]: spec for spec in col.list_indexes()
+                   if spec["name"] != "_id_" and not spec.get("unique") and "partialFilterExpression" not in spec}
+        for name in indexes:
+            col.drop_index(name)
+        if indexes:
+            log.info(f"Dropped {len(indexes)} secondary indexes on {col.name} for the bulk load.")
+        load_failed = True
+        try:
+            yield
+            load_failed = False
+        finally:
+            # One index build per index after the load instead of an index update per inserted document;
+            # each rebuild is independent so one failure neither skips the rest nor hides the load's own error
+            failed = []
+            for name, spec in indexes.items():
+                # Send the spec back as listed; create_index can't take a text index's `_fts` key pattern
+                index_doc = {k: v for k, v in spec.items() if k != "ns"}
+                try:
+                    col.database.command("createIndexes", col.name, indexes=[index_doc])
+                    log.info(f"Rebuilt index {name} on {col.name}.")
+                except Exception as e:
+                    log.error(f"Failed to rebuild index {name} on {col.name}: {e}")
+                    failed.append(name)
+            if failed and not load_failed:
+                raise RuntimeError(f"Failed to rebuild indexes {failed} on {col.name} after the bulk load.")
+
+    def stream_csv_to_mongodb(self, path: str, database: str, collection: str, chunksize: int = 10_000) -> int:
+        """Streams a CSV file into MongoDB chunk by chunk, overlapping parsing with parallel inserts,
+        and returns the number of inserted records."""
         try:
             if not os.path.exists(path):
                 raise FileNotFoundError(f"CSV file not found: {path}")
 
-            data = pd.read_csv(path)
-            data.reset_index(drop=True, inplace=True)
+            total = 0
+            # Column types come from schema.yaml, so the reader skips type inference
+            reader = pacsv.open_csv(path, read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+                                    convert_options=pacsv.ConvertOptions(column_types=read_schema_arrow_types()))
+            col = self.client[database][collection]
+            pending = deque()
+            # The reader thread keeps parsing while a small pool writes; capping pending chunks bounds memory
+            with self._without_secondary_indexes(col), ThreadPoolExecutor(max_workers=MONGO_INSERT_WORKERS) as executor:
+                for batch in reader:
+                    for offset in range(0, batch.num_rows, chunksize):
+                        # Native dicts straight from Arrow; missing cells come out as None
+                        records = batch.slice(offset, chunksize).to_pylist()
+                        if len(pending) >= MONGO_MAX_PENDING_CHUNKS:
+                            total += pending.popleft().result()
+                        pending.append(executor.submit(self._insert_records, col, records))
+                    log.info(f"Inserted {total} records so far into MongoDB collection: {collection}.")
+                while pending:
+                    total += pending.popleft().result()
 
-            records = list(json.loads(data.T.to_json()).values())
-            log.info(f"Successfully converted {len(records)} records from CSV to JSON.")
-
-            return records
+            log.info(f"Successfully streamed {total} records from CSV to MongoDB.")
+            return total
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -55,14 +139,13 @@ class VehicleInsuranceETL:
 
             db = self.client[database]
             col = db[collection]
-            result = col.insert_many(records)
+            with self._without_secondary_indexes(col):
+                inserted = self._insert_records(col, records)
 
-            log.info(f"Inserted {len(result.inserted_ids)} records into MongoDB collection: {collection}.")
-            return len(result.inserted_ids)
+            log.info(f"Inserted {inserted} records into MongoDB collection: {collection}.")
+            return inserted
         except Exception as e:
             raise CustomException(e, sys)
-        finally:
-            self.client.close()  # Ensure the MongoDB connection is closed
 
 
 if __name__ == "__main__":
@@ -73,8 +156,7 @@ if __name__ == "__main__":
     etl = VehicleInsuranceETL()
     
     try:
-        records = etl.csv_to_json(FILE_PATH)
-        num_inserted = etl.load_to_mongodb(records, DATABASE, COLLECTION)
+        num_inserted = etl.stream_csv_to_mongodb(FILE_PATH, DATABASE, COLLECTION)
         print(f"Inserted {num_inserted} records into MongoDB.")
     except Exception as e:
         log.error(f"An error occurred: {e}")